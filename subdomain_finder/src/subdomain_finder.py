@@ -1,112 +1,920 @@
-"""Simple threaded subdomain finder.
+"""Simple asyncio-based subdomain finder.
 
 Behavior:
 - Load a newline-separated wordlist of labels (e.g. www, mail, dev)
-- For each label, attempt to resolve LABEL.TARGET via DNS using dnspython for better reliability
-- If resolution succeeds, optionally attempt an HTTP GET to http://LABEL.TARGET to collect status
+- For each label, attempt to resolve LABEL.TARGET via DNS using aiodns (or dnspython on a thread pool)
+- If resolution succeeds, optionally send an HTTP HEAD (GET if HEAD is rejected) to http://LABEL.TARGET to collect status
 - Report found subdomains with IP and HTTP status
 
 Enhanced with:
 - Better DNS resolution (dnspython with configurable timeout)
 - Retry logic for failed lookups
 - Support for both A and AAAA records
+- Single event loop driving thousands of in-flight queries when aiodns is installed
+- In-process answer cache (positive and negative) and wildcard DNS detection
+- Optional pipelining of all queries over one persistent TCP or DNS-over-TLS connection
+- Optional raw UDP transport: hand-built queries over a small socket pool, minimal answer parser
+- Round-robin across several recursive resolvers, dropping ones that keep failing
+- Pre-flight check that the target exists, optionally querying its authoritative servers directly
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import concurrent.futures
+import ipaddress
 import json
+import random
+import secrets
 import socket
+import ssl
+import struct
 import sys
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
+    import dns.asyncresolver
     import dns.resolver
     import dns.exception
     HAS_DNSPYTHON = True
 except ImportError:
     HAS_DNSPYTHON = False
 
+try:
+    import aiodns
+    import pycares
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Public recursive resolvers used instead of the (often slow) local one;
+# queries are spread across all of them.
+DEFAULT_NAMESERVERS = ["1.1.1.1", "1.0.0.1", "8.8.8.8", "8.8.4.4", "9.9.9.9"]
+
+# A resolver is taken out of rotation once more than this share of its
+# queries (after at least RESOLVER_MIN_SAMPLES) failed transiently.
+RESOLVER_MAX_FAILURE_RATE = 0.5
+RESOLVER_MIN_SAMPLES = 50
+
+# One dnspython resolver for the whole process: built without reading
+# /etc/resolv.conf and with the library's own answer cache enabled.
+if HAS_DNSPYTHON:
+    _RESOLVER = dns.resolver.Resolver(configure=False)
+    _RESOLVER.nameservers = list(DEFAULT_NAMESERVERS)
+    _RESOLVER.cache = dns.resolver.LRUCache(10_000)
+    _RESOLVER.retry_servfail = True
+    _RESOLVER.rotate = True
+else:
+    _RESOLVER = None
+
+# Answer cache: host -> (ip or None, expiry). Failures are cached for a shorter time.
+DNS_CACHE_SIZE = 100_000
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_TTL = 30.0
+
+_DNS_CACHE: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+_DNS_CACHE_LOCK = threading.Lock()
+_MISS = object()
+# Marks a lookup where every attempt failed transiently; never cached.
+_TRANSIENT = object()
+
+# End-of-input marker passed through the scan queues.
+_DONE = object()
+
+# Wire format pieces for RawUDPResolver.
+_QTYPES = {"A": 1, "AAAA": 28}
+_QUERY_FLAGS = struct.pack("!HHHHH", 0x0100, 1, 0, 0, 0)  # RD set, one question
+_HEADER = struct.Struct("!HHHHHH")
+_RR = struct.Struct("!HHIH")
+# FORMERR, SERVFAIL, NOTIMP, REFUSED: this server can't answer, which says nothing about the name.
+_RCODE_TRANSIENT = frozenset({1, 2, 4, 5})
+# Receive buffer for raw UDP sockets, so bursts of answers aren't dropped by the kernel.
+DNS_RCVBUF = 8 * 1024 * 1024
+
+# Shared HTTP session; its pool is resized to the worker count by find_subdomains_async.
+HTTP_POOL_MIN = 10
+# Dead hosts are dropped after this long instead of the full probe timeout.
+HTTP_CONNECT_TIMEOUT = 1.5
+
+
+class _ProbeAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets send tiny requests at once and keep idle connections alive."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = _ProbeAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0, pool_block=False)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_HTTP_POOL_SIZE = HTTP_POOL_MIN
+_SESSION = _build_session(_HTTP_POOL_SIZE)
+
+
+def load_wordlist(path: Path) -> Iterator[str]:
+    """Yield labels from path lazily, skipping blank lines and comments."""
+    with path.open("r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
 
-def load_wordlist(path: Path) -> List[str]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+def _cache_get(host: str):
+    """Return the cached answer for host (possibly None), or _MISS."""
+    now = time.monotonic()
+    with _DNS_CACHE_LOCK:
+        entry = _DNS_CACHE.get(host)
+        if entry is None:
+            return _MISS
+        ip, expiry = entry
+        if expiry <= now:
+            del _DNS_CACHE[host]
+            return _MISS
+        _DNS_CACHE.move_to_end(host)
+        return ip
+
+
+def _cache_put(host: str, ip: Optional[str], ttl: Optional[float] = None) -> None:
+    """Cache an answer for host, honouring the record TTL up to DNS_CACHE_TTL."""
+    if ttl is None:
+        ttl = DNS_CACHE_TTL if ip else DNS_NEGATIVE_TTL
+    expiry = time.monotonic() + min(ttl, DNS_CACHE_TTL)
+    with _DNS_CACHE_LOCK:
+        _DNS_CACHE[host] = (ip, expiry)
+        _DNS_CACHE.move_to_end(host)
+        if len(_DNS_CACHE) > DNS_CACHE_SIZE:
+            _DNS_CACHE.popitem(last=False)
+
+
+def _dumps(item: dict) -> bytes:
+    """Serialize item as compact JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(item)
+    return json.dumps(item, separators=(",", ":")).encode("utf-8")
+
+
+def _backoff(attempt: int) -> float:
+    """Return the delay before retrying after a transient failure (exponential, jittered)."""
+    return min(0.05 * 2 ** attempt, 0.5) + random.uniform(0, 0.05)
 
 
 def resolve_host(host: str, timeout: float = 5.0, retries: int = 2) -> Optional[str]:
     """Return the IPv4/IPv6 address for host, or None if resolution fails.
     
     Uses dnspython if available (more reliable), falls back to socket.gethostbyname.
-    Includes retry logic for transient failures.
+    Only transient failures (timeouts, no reachable nameserver) are retried;
+    NXDOMAIN and empty answers are final. Answers and definite misses are
+    served from the in-process cache while fresh; a lookup that only timed
+    out is not cached.
+    """
+    cached = _cache_get(host)
+    if cached is not _MISS:
+        return cached
+    ip, ttl = _resolve_host_uncached(host, timeout, retries)
+    if ttl is not _TRANSIENT:
+        _cache_put(host, ip, ttl)
+    return ip
+
+
+def _resolve_host_uncached(host: str, timeout: float, retries: int) -> Tuple[Optional[str], object]:
+    """Return (ip, ttl) for host.
+
+    ttl is None when the backend doesn't report one, and _TRANSIENT when
+    every attempt failed transiently.
     """
     if HAS_DNSPYTHON:
         # Try with dnspython first (more reliable timeout handling)
-        resolver = dns.resolver.Resolver()
-        resolver.lifetime = timeout
+        if _RESOLVER.timeout != timeout / 2:
+            _RESOLVER.timeout = timeout / 2
         
         for attempt in range(retries):
             try:
                 # Try to resolve A record (IPv4)
-                answers = resolver.resolve(host, "A")
+                answers = _RESOLVER.resolve(host, "A", lifetime=timeout)
                 for rdata in answers:
-                    return str(rdata)
-            except (dns.exception.Timeout, dns.exception.NXDOMAIN, dns.exception.NoAnswer, dns.exception.DNSException):
-                if attempt < retries - 1:
-                    time.sleep(0.1)  # Brief delay before retry
+                    return str(rdata), answers.rrset.ttl
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                # Authoritative answer: retrying only doubles the load on the server
+                return None, None
+            except (dns.exception.Timeout, dns.resolver.NoNameservers):
+                # No sleep: dnspython has already waited out the lifetime
                 continue
             except Exception:
-                continue
+                return None, None
         
-        return None
+        return None, _TRANSIENT
     else:
         # Fallback to socket.gethostbyname if dnspython not available
         for attempt in range(retries):
             try:
-                return socket.gethostbyname(host)
-            except Exception:
+                return socket.gethostbyname(host), None
+            except socket.gaierror as exc:
+                # Only a temporary resolver failure is worth retrying
+                if exc.errno != socket.EAI_AGAIN:
+                    return None, None
                 if attempt < retries - 1:
-                    time.sleep(0.1)
+                    time.sleep(_backoff(attempt))
                 continue
-        return None
+            except Exception:
+                return None, None
+        return None, _TRANSIENT
+
+
+def check_target(target: str, timeout: float = 5.0, retries: int = 2) -> bool:
+    """Return False if target doesn't exist (NXDOMAIN) or never answers.
+
+    Lets a scan of a non-existent or unreachable domain fail fast instead of
+    sending one query per label. A name without an address or SOA record
+    (NOERROR/NODATA) still exists, so it passes. Without dnspython the SOA
+    lookup isn't possible, so the check always passes.
+    """
+    if not HAS_DNSPYTHON:
+        return True
+    if resolve_host(target, timeout=timeout, retries=retries):
+        return True
+    for attempt in range(retries):
+        try:
+            _RESOLVER.resolve(target, "SOA", lifetime=timeout)
+            return True
+        except dns.resolver.NXDOMAIN:
+            return False
+        except dns.resolver.NoAnswer:
+            return True
+        except (dns.exception.Timeout, dns.resolver.NoNameservers):
+            continue
+    return False
+
+
+def authoritative_nameservers(target: str, timeout: float = 5.0) -> List[str]:
+    """Return the IPv4 addresses of target's authoritative nameservers.
+
+    Returns an empty list if target isn't a zone apex or dnspython is missing.
+    """
+    if not HAS_DNSPYTHON:
+        return []
+    try:
+        answers = _RESOLVER.resolve(target, "NS", lifetime=timeout)
+    except dns.exception.DNSException:
+        return []
+    ips = []
+    for rdata in answers:
+        ip = resolve_host(rdata.target.to_text().rstrip("."), timeout=timeout)
+        if ip and ip not in ips:
+            ips.append(ip)
+    return ips
+
+
+def _configure_http_pool(threads: int) -> None:
+    """Rebuild the shared session if its pool doesn't match the worker count."""
+    global _SESSION, _HTTP_POOL_SIZE
+    size = max(threads, HTTP_POOL_MIN)
+    if size == _HTTP_POOL_SIZE:
+        return
+    old = _SESSION
+    _SESSION = _build_session(size)
+    _HTTP_POOL_SIZE = size
+    old.close()
 
 
 def probe_http(host: str, timeout: float = 5.0) -> Optional[int]:
+    """Return the HTTP status for http://host/, or None if it can't be reached.
+
+    Sends HEAD and only falls back to GET (without reading the body) when the
+    server rejects HEAD. Connecting is capped at HTTP_CONNECT_TIMEOUT.
+    """
     url = f"http://{host}/"
+    http_timeout = (min(HTTP_CONNECT_TIMEOUT, timeout), timeout)
     try:
-        r = requests.get(url, timeout=timeout, allow_redirects=True)
-        return r.status_code
+        with _SESSION.head(url, timeout=http_timeout, allow_redirects=True) as r:
+            status = r.status_code
+        if status in (405, 501):
+            with _SESSION.get(url, timeout=http_timeout, allow_redirects=True, stream=True) as r:
+                status = r.status_code
+        return status
     except Exception:
         return None
 
 
-def find_subdomains(target: str, labels: Iterable[str], threads: int = 20, timeout: float = 5.0, http_probe: bool = True, retries: int = 2):
-    """Yield dicts: {subdomain, ip, http_status}
+class AiodnsResolver:
+    """Async resolver backed by a single aiodns (c-ares) channel.
+
+    The channel's own ``tries``/``timeout`` settings handle retries. Plain
+    DNS queries are sent for the literal name: unlike ``getaddrinfo`` they
+    skip /etc/hosts and the system search domains, and report the record TTL.
+
+    All async resolvers share one interface: ``query`` returns (ip, ttl) or
+    None for a definite miss, and raises TimeoutError when the server could
+    not give an answer.
+    """
+
+    def __init__(self, nameservers: List[str], timeout: float, retries: int):
+        self._resolver = aiodns.DNSResolver(nameservers=nameservers, timeout=timeout, tries=retries, flags=pycares.ARES_FLAG_NOSEARCH)
+
+    async def query(self, host: str, rdtype: str) -> Optional[Tuple[str, float]]:
+        """Return (ip, ttl) for the first A or AAAA record, or None."""
+        try:
+            if hasattr(self._resolver, "query_dns"):
+                # aiodns >= 4
+                res = await self._resolver.query_dns(host, rdtype)
+                records = [(rr.data.addr, rr.ttl) for rr in res.answer if rr.type == _QTYPES[rdtype]]
+            else:
+                res = await self._resolver.query(host, rdtype)
+                records = [(rr.host, rr.ttl) for rr in res]
+        except aiodns.error.DNSError as exc:
+            code = exc.args[0] if exc.args else None
+            if code in (aiodns.error.ARES_ETIMEOUT, aiodns.error.ARES_ECONNREFUSED, aiodns.error.ARES_ESERVFAIL, aiodns.error.ARES_EREFUSED, aiodns.error.ARES_ENOTIMP, aiodns.error.ARES_EFORMERR):
+                raise TimeoutError(host) from exc
+            return None
+        return records[0] if records else None
+
+    def close(self) -> None:
+        self._resolver.cancel()
+
+
+class AsyncDnspythonResolver:
+    """Async resolver backed by dns.asyncresolver, used when aiodns is missing."""
+
+    def __init__(self, nameservers: List[str], timeout: float, retries: int):
+        self._resolver = dns.asyncresolver.Resolver(configure=False)
+        self._resolver.nameservers = list(nameservers)
+        self._resolver.cache = _RESOLVER.cache
+        self._resolver.retry_servfail = True
+        self._resolver.timeout = timeout / 2
+        self._timeout = timeout
+        self._retries = retries
+
+    async def query(self, host: str, rdtype: str) -> Optional[Tuple[str, float]]:
+        """Return (ip, ttl) for the first A or AAAA record, or None."""
+        for attempt in range(self._retries):
+            try:
+                answers = await self._resolver.resolve(host, rdtype, lifetime=self._timeout)
+            except (dns.exception.Timeout, dns.resolver.NoNameservers):
+                continue
+            except dns.exception.DNSException:
+                return None
+            for rdata in answers:
+                return str(rdata), answers.rrset.ttl
+            return None
+        raise TimeoutError(host)
+
+    def close(self) -> None:
+        pass
+
+
+class PipelinedResolver:
+    """Async resolver multiplexing every query over one persistent TCP connection.
+
+    Queries are written back-to-back, each with a unique message ID, and a
+    reader task hands the length-prefixed responses to the waiting futures.
+    If the server closes the connection after answering part of the queue
+    (many cap queries per connection) it is reopened at once and everything
+    still outstanding is re-sent; if it answered nothing, the waiting queries
+    move on to their next attempt. With ``tls=True`` the connection is
+    DNS-over-TLS (port 853).
+    """
+
+    def __init__(self, nameserver: str, timeout: float, retries: int, port: Optional[int] = None, tls: bool = False):
+        self._nameserver = nameserver
+        self._port = port if port is not None else (853 if tls else 53)
+        self._ssl = ssl.create_default_context() if tls else None
+        self._timeout = timeout
+        self._retries = retries
+        self._next_id = 0
+        self._pending: Dict[int, Tuple[asyncio.Future, bytes]] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+
+    def _new_id(self) -> int:
+        while True:
+            self._next_id = (self._next_id + 1) & 0xFFFF
+            if self._next_id not in self._pending:
+                return self._next_id
+
+    async def _ensure_connected(self) -> asyncio.StreamWriter:
+        async with self._connect_lock:
+            if self._writer is None:
+                server_hostname = self._nameserver if self._ssl else None
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._nameserver, self._port, ssl=self._ssl, server_hostname=server_hostname),
+                    self._timeout,
+                )
+                self._writer = writer
+                self._reader_task = asyncio.ensure_future(self._read_loop(reader, writer))
+                for _, framed in self._pending.values():
+                    writer.write(framed)
+            return self._writer
+
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        answered = False
+        try:
+            while True:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+                wire = await reader.readexactly(length)
+                answered = True
+                qid = int.from_bytes(wire[:2], "big")
+                entry = self._pending.get(qid)
+                # The question must echo ours (framed minus length and header),
+                # or this is a late reply to an earlier query with the same ID.
+                if entry is None or entry[0].done() or not wire.startswith(entry[1][2 + _HEADER.size:], _HEADER.size):
+                    continue
+                del self._pending[qid]
+                entry[0].set_result(wire)
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            if self._writer is writer:
+                self._writer = None
+            writer.close()
+        if not self._pending:
+            return
+        if answered:
+            # Servers cap the queries per connection: reopen it and re-send the rest
+            try:
+                await self._ensure_connected()
+                return
+            except (OSError, asyncio.TimeoutError):
+                pass
+        # Nothing got through; fail the waiters so query() moves on to its next attempt
+        for fut, _ in list(self._pending.values()):
+            if not fut.done():
+                fut.set_exception(ConnectionResetError("DNS connection closed"))
+
+    async def query(self, host: str, rdtype: str) -> Optional[Tuple[str, float]]:
+        """Return (ip, ttl) for the first A or AAAA record, or None."""
+        loop = asyncio.get_running_loop()
+        qtype = _QTYPES[rdtype]
+        try:
+            question = _encode_question(host, qtype)
+        except ValueError:
+            return None
+        for attempt in range(self._retries):
+            try:
+                writer = await self._ensure_connected()
+            except (OSError, asyncio.TimeoutError):
+                if attempt < self._retries - 1:
+                    await asyncio.sleep(_backoff(attempt))
+                continue
+            qid = self._new_id()
+            wire = qid.to_bytes(2, "big") + _QUERY_FLAGS + question
+            framed = len(wire).to_bytes(2, "big") + wire
+            fut = loop.create_future()
+            self._pending[qid] = (fut, framed)
+            try:
+                try:
+                    writer.write(framed)
+                    await writer.drain()
+                except OSError:
+                    pass  # still pending: re-sent once the connection is reopened
+                reply = await asyncio.wait_for(fut, self._timeout)
+            except (OSError, asyncio.TimeoutError):
+                continue
+            finally:
+                self._pending.pop(qid, None)
+            try:
+                rcode, answer = _parse_response(reply, qtype, question)
+            except (IndexError, struct.error, ValueError):
+                return None
+            if rcode in _RCODE_TRANSIENT:
+                continue
+            return answer
+        raise TimeoutError(host)
+
+    def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for fut, _ in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+
 
-    This uses a ThreadPoolExecutor to parallelize hostname resolution and optional HTTP checks.
-    Enhanced with retry logic for better reliability on slow/unreliable DNS.
+def _encode_question(host: str, qtype: int) -> bytes:
+    """Return the wire-format question (QNAME, QTYPE, QCLASS=IN) for host."""
+    out = bytearray()
+    for label in host.rstrip(".").split("."):
+        try:
+            raw = label.encode("ascii")
+        except UnicodeEncodeError:
+            raw = label.encode("idna")
+        if not 0 < len(raw) < 64:
+            raise ValueError(f"invalid label in {host!r}")
+        out.append(len(raw))
+        out += raw
+    out += b"\x00" + struct.pack("!HH", qtype, 1)
+    return bytes(out)
+
+
+def _skip_name(buf: bytes, offset: int) -> int:
+    """Return the offset just past the (possibly compressed) name at offset."""
+    while True:
+        length = buf[offset]
+        if length >= 0xC0:
+            return offset + 2
+        offset += length + 1
+        if length == 0:
+            return offset
+
+
+def _parse_response(buf: bytes, qtype: int, question: Optional[bytes] = None) -> Tuple[int, Optional[Tuple[str, int]]]:
+    """Return (rcode, (ip, ttl)) for the first answer of qtype, or (rcode, None).
+
+    Only walks as far as needed: the question is skipped and the answer
+    section scanned for the first A/AAAA record (CNAMEs are stepped over).
+    When the reply echoes ``question`` (the bytes we sent) it is skipped with
+    a single comparison instead of walking its labels.
+    """
+    _, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(buf)
+    rcode = flags & 0xF
+    if question is not None and qdcount == 1 and buf.startswith(question, _HEADER.size):
+        offset = _HEADER.size + len(question)
+    else:
+        offset = _HEADER.size
+        for _ in range(qdcount):
+            offset = _skip_name(buf, offset) + 4
+    for _ in range(ancount):
+        offset = _skip_name(buf, offset)
+        rtype, _, ttl, rdlength = _RR.unpack_from(buf, offset)
+        offset += _RR.size
+        if rtype == qtype and rdlength in (4, 16):
+            family = socket.AF_INET if rdlength == 4 else socket.AF_INET6
+            return rcode, (socket.inet_ntop(family, buf[offset:offset + rdlength]), ttl)
+        offset += rdlength
+    return rcode, None
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    """One connected UDP socket; hands replies to the future waiting on their ID.
+
+    ``pending`` maps each ID to (future, question). A reply whose echoed
+    question differs is a late answer to an earlier query that used the same
+    ID, and is dropped.
+    """
+
+    def __init__(self):
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.pending: Dict[int, Tuple[asyncio.Future, bytes]] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if len(data) < _HEADER.size:
+            return
+        qid = data[0] << 8 | data[1]
+        entry = self.pending.get(qid)
+        if entry is None or entry[0].done() or not data.startswith(entry[1], _HEADER.size):
+            return
+        del self.pending[qid]
+        entry[0].set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        # e.g. ICMP port unreachable; the affected queries simply time out
+        pass
+
+
+class RawUDPResolver:
+    """Async resolver speaking plain DNS over a pool of UDP sockets.
+
+    Queries are assembled by hand (12-byte header + encoded question) and
+    replies are parsed just far enough to pull out the first address, so no
+    dnspython message objects are created per lookup. Queries are spread
+    round-robin over ``sockets`` connected sockets, each with its own 16-bit
+    ID space.
     """
-    target = target.strip().lower().rstrip('.')
 
-    def check(label: str):
-        sub = f"{label}.{target}"
-        ip = resolve_host(sub, timeout=timeout, retries=retries)
-        if not ip:
+    def __init__(self, nameserver: str, timeout: float, retries: int, port: int = 53, sockets: int = 4):
+        self._addr = (nameserver, port)
+        self._timeout = timeout
+        self._retries = retries
+        self._size = sockets
+        self._protocols: List[_UDPProtocol] = []
+        self._next = 0
+        self._open_lock = asyncio.Lock()
+
+    async def _protocol(self) -> _UDPProtocol:
+        if not self._protocols:
+            async with self._open_lock:
+                if not self._protocols:
+                    loop = asyncio.get_running_loop()
+                    for _ in range(self._size):
+                        transport, proto = await loop.create_datagram_endpoint(_UDPProtocol, remote_addr=self._addr)
+                        try:
+                            transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DNS_RCVBUF)
+                        except OSError:
+                            pass  # kernel refused; keep the default buffer
+                        self._protocols.append(proto)
+        self._next = (self._next + 1) % len(self._protocols)
+        return self._protocols[self._next]
+
+    async def query(self, host: str, rdtype: str) -> Optional[Tuple[str, float]]:
+        """Return (ip, ttl) for the first A or AAAA record, or None."""
+        qtype = _QTYPES[rdtype]
+        try:
+            question = _encode_question(host, qtype)
+        except ValueError:
+            return None
+        try:
+            proto = await self._protocol()
+        except OSError as exc:
+            # A local socket problem says nothing about the name; let callers fail over
+            raise TimeoutError(host) from exc
+        loop = asyncio.get_running_loop()
+        for attempt in range(self._retries):
+            qid = random.getrandbits(16)
+            while qid in proto.pending:
+                qid = random.getrandbits(16)
+            fut = loop.create_future()
+            proto.pending[qid] = (fut, question)
+            try:
+                proto.transport.sendto(qid.to_bytes(2, "big") + _QUERY_FLAGS + question)
+                reply = await asyncio.wait_for(fut, self._timeout)
+            except (OSError, asyncio.TimeoutError):
+                continue
+            finally:
+                proto.pending.pop(qid, None)
+            try:
+                rcode, answer = _parse_response(reply, qtype, question)
+            except (IndexError, struct.error, ValueError):
+                return None
+            if rcode in _RCODE_TRANSIENT:
+                continue
+            return answer
+        raise TimeoutError(host)
+
+    def close(self) -> None:
+        for proto in self._protocols:
+            for fut, _ in proto.pending.values():
+                fut.cancel()
+            proto.pending.clear()
+            if proto.transport is not None:
+                proto.transport.close()
+        self._protocols = []
+
+
+class RotatingResolver:
+    """Spreads queries round-robin over one async resolver per nameserver.
+
+    A query that times out is retried on the next server, up to ``retries``
+    attempts in total. Servers whose transient failure rate exceeds
+    RESOLVER_MAX_FAILURE_RATE are dropped from the rotation; the last one is
+    always kept.
+
+    Each record type keeps its own place in the rotation, so A lookups reach
+    every server even though each host asks for A and then AAAA.
+    """
+
+    def __init__(self, resolvers: Dict[str, object], retries: int):
+        self._resolvers = resolvers
+        self._active = list(resolvers)
+        self._retries = max(retries, 1)
+        self._next: Dict[str, int] = {}
+        self._stats: Dict[str, List[int]] = {ns: [0, 0] for ns in resolvers}
+        self.dropped: List[str] = []
+
+    async def query(self, host: str, rdtype: str) -> Optional[Tuple[str, float]]:
+        """Return (ip, ttl) for the first A or AAAA record, or None."""
+        for attempt in range(self._retries):
+            turn = self._next.get(rdtype, 0)
+            self._next[rdtype] = turn + 1
+            ns = self._active[turn % len(self._active)]
+            stats = self._stats[ns]
+            stats[0] += 1
+            try:
+                return await self._resolvers[ns].query(host, rdtype)
+            except TimeoutError:
+                stats[1] += 1
+                self._maybe_drop(ns)
+        raise TimeoutError(host)
+
+    def _maybe_drop(self, ns: str) -> None:
+        queries, failures = self._stats[ns]
+        if ns in self._active and len(self._active) > 1 and queries >= RESOLVER_MIN_SAMPLES and failures / queries > RESOLVER_MAX_FAILURE_RATE:
+            self._active.remove(ns)
+            self.dropped.append(ns)
+
+    def close(self) -> None:
+        for resolver in self._resolvers.values():
+            resolver.close()
+
+
+def _make_async_resolver(timeout: float, retries: int, transport: str = "auto", nameservers: Optional[List[str]] = None):
+    """Return the best available async resolver, or None to use resolve_host on threads.
+
+    With several nameservers, each gets its own single-try resolver and
+    RotatingResolver handles retries across them.
+    """
+    nameservers = nameservers or DEFAULT_NAMESERVERS
+    if transport in ("tcp", "tls"):
+        make = lambda ns, tries: PipelinedResolver(ns, timeout, tries, tls=transport == "tls")
+    elif transport == "udp":
+        make = lambda ns, tries: RawUDPResolver(ns, timeout, tries)
+    elif HAS_AIODNS:
+        make = lambda ns, tries: AiodnsResolver([ns], timeout, tries)
+    elif HAS_DNSPYTHON:
+        make = lambda ns, tries: AsyncDnspythonResolver([ns], timeout, tries)
+    else:
+        return None
+    if len(nameservers) == 1:
+        return make(nameservers[0], retries)
+    return RotatingResolver({ns: make(ns, 1) for ns in nameservers}, retries)
+
+
+async def resolve_host_async(resolver, host: str) -> Optional[str]:
+    """Return the address for host using an async resolver, or None.
+
+    A and AAAA are queried concurrently. The IPv4 answer wins when both
+    exist, and the AAAA query is abandoned as soon as it does. Shares the
+    answer cache with ``resolve_host``; a lookup where both queries timed
+    out is not cached.
+    """
+    cached = _cache_get(host)
+    if cached is not _MISS:
+        return cached
+    timed_out = 0
+
+    async def settle(fut):
+        nonlocal timed_out
+        try:
+            return await fut
+        except TimeoutError:
+            timed_out += 1
+            return None
+
+    a = asyncio.ensure_future(resolver.query(host, "A"))
+    aaaa = asyncio.ensure_future(resolver.query(host, "AAAA"))
+    try:
+        answer = await settle(a) or await settle(aaaa)
+    finally:
+        a.cancel()
+        aaaa.cancel()
+    if answer is None:
+        if timed_out < 2:
+            _cache_put(host, None)
+        return None
+    ip, ttl = answer
+    _cache_put(host, ip, ttl)
+    return ip
+
+
+async def find_subdomains_async(target: str, labels: Iterable[str], threads: int = 20, timeout: float = 5.0, http_probe: bool = True, retries: int = 2, transport: str = "auto", nameservers: Optional[List[str]] = None):
+    """Async generator yielding dicts: {subdomain, ip, http_status}
+
+    Labels are consumed lazily by a producer feeding a bounded queue
+    (``threads * 4``) that ``threads`` worker coroutines drain, so the amount
+    of outstanding work never depends on the wordlist size. DNS goes through
+    aiodns when installed,
+    then dns.asyncresolver, otherwise ``resolve_host`` runs on a thread pool
+    of the same size. HTTP probes always run on that pool. ``transport`` set
+    to "tcp" or "tls" pipelines all DNS over one connection instead, and
+    "udp" uses RawUDPResolver.
+    ``nameservers`` overrides DEFAULT_NAMESERVERS for the async resolvers;
+    with more than one, queries rotate across them.
+
+    Before scanning, two random labels are resolved; any IP they return is
+    treated as a wildcard answer and matching results are dropped.
+    """
+    target = sys.intern(target.strip().lower().rstrip('.'))
+    suffix = "." + target
+    loop = asyncio.get_running_loop()
+    q_in: asyncio.Queue = asyncio.Queue(maxsize=threads * 4)
+    q_out: asyncio.Queue = asyncio.Queue(maxsize=threads * 4)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+    resolver = _make_async_resolver(timeout, retries, transport, nameservers)
+    if http_probe:
+        _configure_http_pool(threads)
+
+    async def resolve(sub: str) -> Optional[str]:
+        if resolver is not None:
+            return await resolve_host_async(resolver, sub)
+        return await loop.run_in_executor(executor, resolve_host, sub, timeout, retries)
+
+    async def check(sub: str):
+        ip = await resolve(sub)
+        if not ip or ip in wildcard_ips:
             return None
         http_status = None
         if http_probe:
-            http_status = probe_http(sub, timeout=timeout)
+            http_status = await loop.run_in_executor(executor, probe_http, sub, timeout)
         return {"subdomain": sub, "ip": ip, "http_status": http_status}
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as ex:
-        futures = {ex.submit(check, label): label for label in labels}
-        for fut in concurrent.futures.as_completed(futures):
-            res = fut.result()
-            if res:
+    async def produce():
+        try:
+            # Hostnames are built here so workers only do I/O
+            for label in labels:
+                await q_in.put(label + suffix)
+        except Exception as exc:
+            await q_out.put(exc)
+        for _ in range(threads):
+            await q_in.put(_DONE)
+
+    async def worker():
+        while True:
+            sub = await q_in.get()
+            if sub is _DONE:
+                await q_out.put(_DONE)
+                return
+            try:
+                res = await check(sub)
+            except Exception as exc:
+                res = exc
+            await q_out.put(res)
+
+    tasks = []
+    try:
+        probes = [f"{secrets.token_hex(8)}.{target}" for _ in range(2)]
+        wildcard_ips = {ip for ip in await asyncio.gather(*(resolve(p) for p in probes)) if ip}
+
+        tasks.append(asyncio.ensure_future(produce()))
+        tasks.extend(asyncio.ensure_future(worker()) for _ in range(threads))
+        running = threads
+        while running:
+            res = await q_out.get()
+            if res is _DONE:
+                running -= 1
+            elif isinstance(res, Exception):
+                raise res
+            elif res:
                 yield res
+    finally:
+        # Runs on normal completion, early close and cancellation (Ctrl-C) alike
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if resolver is not None:
+            resolver.close()
+        _shutdown_executor(executor)
+
+
+def _shutdown_executor(executor: concurrent.futures.ThreadPoolExecutor) -> None:
+    """Shut executor down without waiting, dropping work that hasn't started."""
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=False, cancel_futures=True)
+    else:
+        executor.shutdown(wait=False)
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop, agen) -> None:
+    """Cancel whatever is still running on loop, let agen clean up, then close loop.
+
+    After Ctrl-C the step that was driving agen is still pending; cancelling
+    it delivers CancelledError into the scan so its cleanup runs right away
+    instead of every in-flight query running to its timeout.
+    """
+    try:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(agen.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+
+def find_subdomains(target: str, labels: Iterable[str], threads: int = 20, timeout: float = 5.0, http_probe: bool = True, retries: int = 2, transport: str = "auto", nameservers: Optional[List[str]] = None):
+    """Yield dicts: {subdomain, ip, http_status}
+
+    Synchronous wrapper around ``find_subdomains_async`` for the CLI. Results
+    are yielded as soon as each lookup completes. Closing the generator early
+    or interrupting it cancels all outstanding work.
+    """
+    loop = asyncio.new_event_loop()
+    agen = find_subdomains_async(target, labels, threads=threads, timeout=timeout, http_probe=http_probe, retries=retries, transport=transport, nameservers=nameservers)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        _close_loop(loop, agen)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -118,6 +926,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument("--retries", type=int, default=2, help="Number of retries for failed DNS lookups")
     parser.add_argument("-o", "--output", help="Write found subdomains to this file (JSON lines)")
     parser.add_argument("--no-http", dest="http_probe", action="store_false", help="Skip HTTP probing (faster, DNS-only)")
+    parser.add_argument("--resolvers", help=f"Comma-separated recursive resolver IPs to rotate across (default: {','.join(DEFAULT_NAMESERVERS)})")
+    parser.add_argument("--authoritative", action="store_true", help="Query the target's authoritative nameservers directly (faster; misses CNAMEs pointing outside the zone)")
+    parser.add_argument("--transport", choices=["auto", "udp", "tcp", "tls"], default="auto", help="DNS transport: auto (UDP via aiodns/dnspython), udp (raw sockets, no DNS library), or pipelined over one TCP / DNS-over-TLS connection")
 
     args = parser.parse_args(argv)
 
@@ -126,34 +937,86 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Wordlist not found: {wordlist_path}", file=sys.stderr)
         return 2
 
-    labels = load_wordlist(wordlist_path)
+    nameservers = None
+    if args.resolvers:
+        nameservers = [ns.strip() for ns in args.resolvers.split(",") if ns.strip()]
+        try:
+            for ns in nameservers:
+                ipaddress.ip_address(ns)
+        except ValueError:
+            print(f"--resolvers must be a comma-separated list of IP addresses, got: {args.resolvers}", file=sys.stderr)
+            return 2
+        if HAS_DNSPYTHON:
+            _RESOLVER.nameservers = list(nameservers)
+
+    target = args.target.strip().lower().rstrip('.')
+    if not check_target(target, timeout=args.timeout, retries=args.retries):
+        print(f"Target {target} has no A/AAAA or SOA record (does it exist?); aborting", file=sys.stderr)
+        return 3
+
+    authoritative = authoritative_nameservers(target, timeout=args.timeout) if args.authoritative else []
+    if authoritative:
+        nameservers = authoritative
+
+    attempted = 0
+
+    def counted(labels: Iterable[str]) -> Iterator[str]:
+        nonlocal attempted
+        for label in labels:
+            attempted += 1
+            yield label
+
+    labels = counted(load_wordlist(wordlist_path))
     out_path = Path(args.output) if args.output else None
 
-    print(f"[*] Starting scan of {args.target} with {len(labels)} labels ({args.threads} threads)")
+    print(f"[*] Starting scan of {target} using {wordlist_path} ({args.threads} concurrent lookups)")
     print(f"[*] DNS timeout: {args.timeout}s, Retries: {args.retries}")
-    if HAS_DNSPYTHON:
-        print(f"[*] Using dnspython for reliable DNS resolution")
+    if authoritative:
+        print(f"[*] Querying authoritative nameservers directly")
+    elif args.authoritative:
+        print(f"[*] Could not resolve authoritative nameservers for {target}")
+    print(f"[*] Nameservers (round-robin): {', '.join(nameservers or DEFAULT_NAMESERVERS)}")
+    if args.transport == "udp":
+        print(f"[*] Sending raw UDP queries")
+    elif args.transport != "auto":
+        print(f"[*] Pipelining DNS over one {args.transport.upper()} connection per nameserver")
+    elif HAS_AIODNS:
+        print(f"[*] Using aiodns for asynchronous DNS resolution (A + AAAA)")
+    elif HAS_DNSPYTHON:
+        print(f"[*] Using dnspython's async resolver for DNS resolution (A + AAAA)")
     else:
         print(f"[*] Using socket.gethostbyname (install dnspython for better reliability)")
     print()
 
-    results = []
+    out_fh = None
+    if out_path:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unbuffered so every line reaches the file as soon as it's found
+        out_fh = out_path.open("ab", buffering=0)
+
+    found = 0
+    interrupted = False
     start = time.time()
-    for item in find_subdomains(args.target, labels, threads=args.threads, timeout=args.timeout, http_probe=args.http_probe, retries=args.retries):
-        print(f"FOUND: {item['subdomain']} -> {item['ip']} (http={item['http_status']})")
-        results.append(item)
-        if out_path:
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            with out_path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(item) + "\n")
+    try:
+        for item in find_subdomains(target, labels, threads=args.threads, timeout=args.timeout, http_probe=args.http_probe, retries=args.retries, transport=args.transport, nameservers=nameservers):
+            print(f"FOUND: {item['subdomain']} -> {item['ip']} (http={item['http_status']})")
+            found += 1
+            if out_fh:
+                out_fh.write(_dumps(item) + b"\n")
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n[!] Interrupted; outstanding lookups cancelled", file=sys.stderr)
+    finally:
+        if out_fh:
+            out_fh.close()
 
     elapsed = time.time() - start
     print()
-    print(f"Done. {len(results)} subdomains found in {elapsed:.2f}s ({len(results)/elapsed:.1f} results/sec)")
-    print(f"Total labels attempted: {len(labels)}")
+    print(f"Done. {found} subdomains found in {elapsed:.2f}s ({found/elapsed:.1f} results/sec)")
+    print(f"Total labels attempted: {attempted}")
     if out_path:
         print(f"Results saved to: {out_path}")
-    return 0
+    return 130 if interrupted else 0
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+import asyncio
+import json
 import socket
+import time
 from unittest import mock
 
 import pytest
@@ -6,14 +9,79 @@ import pytest
 from subdomain_finder.src import subdomain_finder
 
 
+@pytest.fixture(autouse=True)
+def clear_dns_cache():
+    subdomain_finder._DNS_CACHE.clear()
+    yield
+    subdomain_finder._DNS_CACHE.clear()
+
+
 def test_load_wordlist(tmp_path):
     p = tmp_path / "wl.txt"
     p.write_text("a\nb\n#comment\nc\n")
     labels = subdomain_finder.load_wordlist(p)
-    assert labels == ["a", "b", "c"]
+    assert list(labels) == ["a", "b", "c"]
+
+
+def test_find_subdomains_bounds_scheduled_checks(monkeypatch):
+    consumed = []
+
+    def labels():
+        for i in range(100):
+            consumed.append(i)
+            yield "exists" if i == 0 else f"nope{i}"
+
+    def fake_gethostbyname(host):
+        if host.startswith("exists."):
+            return "5.6.7.8"
+        raise socket.gaierror()
+
+    monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    monkeypatch.setattr(subdomain_finder, "HAS_AIODNS", False)
+
+    results = subdomain_finder.find_subdomains("example.com", labels(), threads=2, http_probe=False, retries=1)
+    assert next(results)["subdomain"] == "exists.example.com"
+    # Only a small window of labels has been pulled from the generator
+    assert len(consumed) < 20
+    results.close()
+
+
+def test_find_subdomains_close_cancels_outstanding_lookups(monkeypatch):
+    cancelled = []
+
+    class SlowResolver:
+        closed = False
+
+        async def query(self, host, rdtype):
+            if host.startswith("exists.") and rdtype == "A":
+                return "5.6.7.8", 60
+            if not host.startswith("slow"):
+                return None
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(host)
+                raise
+
+        def close(self):
+            SlowResolver.closed = True
+
+    monkeypatch.setattr(subdomain_finder, "_make_async_resolver", lambda *args, **kwargs: SlowResolver())
+
+    labels = ["exists"] + [f"slow{i}" for i in range(5)]
+    results = subdomain_finder.find_subdomains("example.com", labels, threads=8, http_probe=False)
+    assert next(results)["subdomain"] == "exists.example.com"
+    start = time.monotonic()
+    results.close()
+    assert time.monotonic() - start < 2
 
+    assert SlowResolver.closed
+    assert {f"slow{i}.example.com" for i in range(5)} <= set(cancelled)
 
-def test_resolve_host_success_and_failure():
+
+def test_resolve_host_success_and_failure(monkeypatch):
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
     # Patch socket.gethostbyname to control behavior
     def side_effect(host):
         if host.startswith("exists."):
@@ -25,6 +93,42 @@ def test_resolve_host_success_and_failure():
         assert subdomain_finder.resolve_host("nope.example.com") is None
 
 
+def _fake_response(status_code):
+    response = mock.MagicMock(status_code=status_code)
+    response.__enter__.return_value = response
+    return response
+
+
+def test_probe_http_uses_shared_session_head(monkeypatch):
+    head = mock.Mock(return_value=_fake_response(204))
+    get = mock.Mock()
+    monkeypatch.setattr(subdomain_finder._SESSION, "head", head)
+    monkeypatch.setattr(subdomain_finder._SESSION, "get", get)
+
+    assert subdomain_finder.probe_http("exists.example.com", timeout=2.0) == 204
+    head.assert_called_once_with("http://exists.example.com/", timeout=(1.5, 2.0), allow_redirects=True)
+    head.return_value.__exit__.assert_called_once()
+    get.assert_not_called()
+
+
+def test_http_session_sets_socket_options():
+    session = subdomain_finder._build_session(4)
+    adapter = session.get_adapter("http://example.com/")
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    session.close()
+
+
+def test_probe_http_falls_back_to_get_when_head_rejected(monkeypatch):
+    monkeypatch.setattr(subdomain_finder._SESSION, "head", mock.Mock(return_value=_fake_response(405)))
+    get = mock.Mock(return_value=_fake_response(200))
+    monkeypatch.setattr(subdomain_finder._SESSION, "get", get)
+
+    assert subdomain_finder.probe_http("exists.example.com", timeout=1.0) == 200
+    get.assert_called_once_with("http://exists.example.com/", timeout=(1.0, 1.0), allow_redirects=True, stream=True)
+
+
 def test_find_subdomains_with_mocked_dns(monkeypatch):
     labels = ["exists", "nope"]
 
@@ -34,8 +138,510 @@ def test_find_subdomains_with_mocked_dns(monkeypatch):
         raise socket.gaierror()
 
     monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    monkeypatch.setattr(subdomain_finder, "HAS_AIODNS", False)
 
     results = list(subdomain_finder.find_subdomains("example.com", labels, threads=2, http_probe=False))
     assert len(results) == 1
     assert results[0]["subdomain"] == "exists.example.com"
     assert results[0]["ip"] == "5.6.7.8"
+
+
+def test_resolve_host_retries_only_transient_errors(monkeypatch):
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    sleep = mock.Mock()
+    monkeypatch.setattr(subdomain_finder.time, "sleep", sleep)
+    calls = []
+
+    def fake_gethostbyname(host):
+        calls.append(host)
+        if host.startswith("again."):
+            raise socket.gaierror(socket.EAI_AGAIN, "temporary failure")
+        raise socket.gaierror(socket.EAI_NONAME, "not known")
+
+    monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+
+    assert subdomain_finder.resolve_host("nope.example.com", retries=3) is None
+    sleep.assert_not_called()
+    assert subdomain_finder.resolve_host("again.example.com", retries=3) is None
+    assert sleep.call_count == 2
+    assert calls == ["nope.example.com"] + ["again.example.com"] * 3
+    assert all(0 < call.args[0] <= 0.55 for call in sleep.call_args_list)
+
+
+def test_resolve_host_reuses_dnspython_resolver(monkeypatch):
+    pytest.importorskip("dns.resolver")
+    answers = mock.MagicMock()
+    answers.__iter__.return_value = iter(["1.2.3.4"])
+    answers.rrset.ttl = 60
+    resolver = mock.Mock(timeout=2.5)
+    resolver.resolve.return_value = answers
+    monkeypatch.setattr(subdomain_finder, "_RESOLVER", resolver)
+
+    assert subdomain_finder.resolve_host("exists.example.com") == "1.2.3.4"
+    resolver.resolve.assert_called_once_with("exists.example.com", "A", lifetime=5.0)
+
+
+def test_resolve_host_does_not_retry_nxdomain(monkeypatch):
+    pytest.importorskip("dns.resolver")
+    import dns.exception
+    import dns.resolver
+
+    def fake_resolve(host, rdtype, lifetime):
+        if host.startswith("slow."):
+            raise dns.exception.Timeout()
+        raise dns.resolver.NXDOMAIN()
+
+    resolver = mock.Mock(timeout=2.5, resolve=mock.Mock(side_effect=fake_resolve))
+    monkeypatch.setattr(subdomain_finder, "_RESOLVER", resolver)
+
+    assert subdomain_finder.resolve_host("nope.example.com", retries=3) is None
+    assert resolver.resolve.call_count == 1
+    assert subdomain_finder.resolve_host("slow.example.com", retries=3) is None
+    assert resolver.resolve.call_count == 4
+
+
+def test_resolve_host_caches_answers(monkeypatch):
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    calls = []
+
+    def fake_gethostbyname(host):
+        calls.append(host)
+        if host.startswith("exists."):
+            return "1.2.3.4"
+        raise socket.gaierror()
+
+    monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+
+    for _ in range(3):
+        assert subdomain_finder.resolve_host("exists.example.com") == "1.2.3.4"
+        assert subdomain_finder.resolve_host("nope.example.com", retries=1) is None
+    assert calls == ["exists.example.com", "nope.example.com"]
+
+
+def test_find_subdomains_skips_wildcard_answers(monkeypatch):
+    def fake_gethostbyname(host):
+        if host.startswith("exists."):
+            return "5.6.7.8"
+        return "10.0.0.1"
+
+    monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    monkeypatch.setattr(subdomain_finder, "HAS_AIODNS", False)
+
+    results = list(subdomain_finder.find_subdomains("example.com", ["exists", "anything"], threads=2, http_probe=False))
+    assert [r["subdomain"] for r in results] == ["exists.example.com"]
+
+
+def test_find_subdomains_with_aiodns(monkeypatch):
+    class FakeDNSError(Exception):
+        pass
+
+    class FakeResolver:
+        def __init__(self, **kwargs):
+            pass
+
+        async def query_dns(self, host, rdtype):
+            if host.startswith("exists.") and rdtype == "A":
+                record = mock.Mock(type=1, ttl=60, data=mock.Mock(addr="9.9.9.9"))
+                return mock.Mock(answer=[record])
+            raise FakeDNSError()
+
+        def cancel(self):
+            pass
+
+    fake_aiodns = mock.Mock(DNSResolver=FakeResolver)
+    fake_aiodns.error.DNSError = FakeDNSError
+    monkeypatch.setattr(subdomain_finder, "aiodns", fake_aiodns, raising=False)
+    monkeypatch.setattr(subdomain_finder, "pycares", mock.Mock(), raising=False)
+    monkeypatch.setattr(subdomain_finder, "HAS_AIODNS", True)
+
+    results = list(subdomain_finder.find_subdomains("example.com", ["exists", "nope"], threads=2, http_probe=False))
+    assert results == [{"subdomain": "exists.example.com", "ip": "9.9.9.9", "http_status": None}]
+
+
+def test_aiodns_resolver_queries_only_the_literal_name(monkeypatch):
+    pytest.importorskip("aiodns")
+    dns_message = pytest.importorskip("dns.message")
+    import dns.rcode
+    import dns.rrset
+
+    monkeypatch.setenv("LOCALDOMAIN", "corp.test")
+    seen = []
+
+    class Server(asyncio.DatagramProtocol):
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            query = dns_message.from_wire(data)
+            name = query.question[0].name
+            seen.append(name.to_text())
+            response = dns_message.make_response(query)
+            if name.to_text().startswith("exists."):
+                response.answer.append(dns.rrset.from_text(name, 60, "IN", "A", "1.2.3.4"))
+            else:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            self.transport.sendto(response.to_wire(), addr)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(Server, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        resolver = subdomain_finder.AiodnsResolver([f"127.0.0.1:{port}"], timeout=2.0, retries=1)
+        try:
+            return [await resolver.query("exists.example.com", "A"), await resolver.query("nope.example.com", "A")]
+        finally:
+            resolver.close()
+            transport.close()
+
+    assert asyncio.run(run()) == [("1.2.3.4", 60), None]
+    assert seen == ["exists.example.com.", "nope.example.com."]
+
+
+def test_resolve_host_async_prefers_a_and_falls_back_to_aaaa():
+    class FakeResolver:
+        async def query(self, host, rdtype):
+            if host.startswith("both.") or rdtype == "AAAA":
+                return ("1.2.3.4" if rdtype == "A" else "2001:db8::1"), 60
+            return None
+
+    resolve = subdomain_finder.resolve_host_async
+    assert asyncio.run(resolve(FakeResolver(), "both.example.com")) == "1.2.3.4"
+    assert asyncio.run(resolve(FakeResolver(), "v6.example.com")) == "2001:db8::1"
+
+
+def test_pipelined_resolver_matches_responses_by_id():
+    dns_message = pytest.importorskip("dns.message")
+    import dns.rcode
+    import dns.rrset
+
+    async def handle(reader, writer):
+        # Collect two queries, then answer them in reverse order.
+        queries = []
+        for _ in range(2):
+            length = int.from_bytes(await reader.readexactly(2), "big")
+            queries.append(dns_message.from_wire(await reader.readexactly(length)))
+        for query in reversed(queries):
+            response = dns_message.make_response(query)
+            name = query.question[0].name
+            if name.to_text().startswith("exists."):
+                response.answer.append(dns.rrset.from_text(name, 60, "IN", "A", "1.2.3.4"))
+            else:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            wire = response.to_wire()
+            writer.write(len(wire).to_bytes(2, "big") + wire)
+        await writer.drain()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        resolver = subdomain_finder.PipelinedResolver("127.0.0.1", timeout=2.0, retries=1, port=port)
+        try:
+            return await asyncio.gather(
+                resolver.query("exists.example.com", "A"),
+                resolver.query("nope.example.com", "A"),
+            )
+        finally:
+            resolver.close()
+            server.close()
+
+    assert asyncio.run(run()) == [("1.2.3.4", 60), None]
+
+
+def test_pipelined_resolver_resends_after_server_closes():
+    dns_message = pytest.importorskip("dns.message")
+    import dns.rrset
+
+    async def handle(reader, writer):
+        # Answer two queries per connection, then hang up like a capped resolver.
+        for _ in range(2):
+            length = int.from_bytes(await reader.readexactly(2), "big")
+            query = dns_message.from_wire(await reader.readexactly(length))
+            response = dns_message.make_response(query)
+            response.answer.append(dns.rrset.from_text(query.question[0].name, 60, "IN", "A", "1.2.3.4"))
+            wire = response.to_wire()
+            writer.write(len(wire).to_bytes(2, "big") + wire)
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        resolver = subdomain_finder.PipelinedResolver("127.0.0.1", timeout=2.0, retries=1, port=port)
+        try:
+            start = time.monotonic()
+            answers = await asyncio.gather(*(resolver.query(f"h{i}.example.com", "A") for i in range(10)))
+            return answers, time.monotonic() - start
+        finally:
+            resolver.close()
+            server.close()
+
+    answers, elapsed = asyncio.run(run())
+    assert answers == [("1.2.3.4", 60)] * 10
+    assert elapsed < 1.0
+
+
+def test_main_writes_json_lines(tmp_path, monkeypatch):
+    wordlist = tmp_path / "wl.txt"
+    wordlist.write_text("a\nb\n")
+    out = tmp_path / "out" / "results.jsonl"
+    items = [
+        {"subdomain": "a.example.com", "ip": "1.1.1.1", "http_status": None},
+        {"subdomain": "b.example.com", "ip": "2.2.2.2", "http_status": 200},
+    ]
+    monkeypatch.setattr(subdomain_finder, "find_subdomains", lambda *args, **kwargs: iter(items))
+    monkeypatch.setattr(subdomain_finder, "check_target", lambda *args, **kwargs: True)
+
+    rc = subdomain_finder.main(["-t", "example.com", "-w", str(wordlist), "-o", str(out)])
+    assert rc == 0
+    assert [json.loads(line) for line in out.read_text().splitlines()] == items
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_dumps_matches_stdlib_json(monkeypatch, has_orjson):
+    if has_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(subdomain_finder, "HAS_ORJSON", has_orjson)
+    item = {"subdomain": "a.example.com", "ip": "1.1.1.1", "http_status": None}
+    assert json.loads(subdomain_finder._dumps(item)) == item
+
+
+def test_main_aborts_when_target_does_not_exist(tmp_path, monkeypatch):
+    wordlist = tmp_path / "wl.txt"
+    wordlist.write_text("a\n")
+    monkeypatch.setattr(subdomain_finder, "check_target", lambda *args, **kwargs: False)
+    find = mock.Mock()
+    monkeypatch.setattr(subdomain_finder, "find_subdomains", find)
+
+    assert subdomain_finder.main(["-t", "nope.invalid", "-w", str(wordlist)]) == 3
+    find.assert_not_called()
+
+
+def test_check_target_accepts_soa_only_zone(monkeypatch):
+    pytest.importorskip("dns.resolver")
+    import dns.resolver
+
+    def fake_resolve(host, rdtype, lifetime):
+        if rdtype == "SOA":
+            return mock.Mock()
+        raise dns.resolver.NoAnswer()
+
+    monkeypatch.setattr(subdomain_finder, "_RESOLVER", mock.Mock(timeout=2.5, resolve=fake_resolve))
+    assert subdomain_finder.check_target("example.com", retries=1) is True
+
+
+def test_check_target_distinguishes_nodata_from_nxdomain(monkeypatch):
+    pytest.importorskip("dns.resolver")
+    import dns.exception
+    import dns.resolver
+
+    def fake_resolve(host, rdtype, lifetime):
+        if host.startswith("nodata."):
+            raise dns.resolver.NoAnswer()
+        if host.startswith("slow."):
+            raise dns.exception.Timeout()
+        raise dns.resolver.NXDOMAIN()
+
+    resolver = mock.Mock(timeout=2.5, resolve=mock.Mock(side_effect=fake_resolve))
+    monkeypatch.setattr(subdomain_finder, "_RESOLVER", resolver)
+
+    assert subdomain_finder.check_target("nodata.example.com", retries=2) is True
+    assert subdomain_finder.check_target("nope.example.com", retries=2) is False
+    assert subdomain_finder.check_target("slow.example.com", retries=2) is False
+
+def test_resolve_host_does_not_cache_timeouts(monkeypatch):
+    pytest.importorskip("dns.resolver")
+    import dns.exception
+
+    resolver = mock.Mock(timeout=2.5, resolve=mock.Mock(side_effect=dns.exception.Timeout()))
+    monkeypatch.setattr(subdomain_finder, "_RESOLVER", resolver)
+    assert subdomain_finder.resolve_host("slow.example.com", retries=2) is None
+    assert "slow.example.com" not in subdomain_finder._DNS_CACHE
+
+    def fake_gethostbyname(host):
+        raise socket.gaierror(socket.EAI_AGAIN if host.startswith("slow.") else socket.EAI_NONAME, "")
+
+    monkeypatch.setattr(socket, "gethostbyname", fake_gethostbyname)
+    monkeypatch.setattr(subdomain_finder, "HAS_DNSPYTHON", False)
+    monkeypatch.setattr(subdomain_finder, "_backoff", lambda attempt: 0)
+    assert subdomain_finder.resolve_host("slow.example.com", retries=2) is None
+    assert subdomain_finder.resolve_host("nope.example.com", retries=2) is None
+    assert "slow.example.com" not in subdomain_finder._DNS_CACHE
+    assert subdomain_finder._DNS_CACHE["nope.example.com"][0] is None
+
+
+def test_raw_udp_wire_format_matches_dnspython():
+    dns_message = pytest.importorskip("dns.message")
+    import dns.rcode
+    import dns.rrset
+
+    query = dns_message.make_query("www.example.com", "A")
+    assert subdomain_finder._encode_question("www.example.com", 1) == query.to_wire()[12:]
+
+    response = dns_message.make_response(query)
+    response.answer.append(dns.rrset.from_text("www.example.com.", 300, "IN", "CNAME", "edge.example.net."))
+    response.answer.append(dns.rrset.from_text("edge.example.net.", 60, "IN", "A", "1.2.3.4"))
+    assert subdomain_finder._parse_response(response.to_wire(), 1) == (0, ("1.2.3.4", 60))
+    question = subdomain_finder._encode_question("www.example.com", 1)
+    assert subdomain_finder._parse_response(response.to_wire(), 1, question) == (0, ("1.2.3.4", 60))
+    assert subdomain_finder._parse_response(response.to_wire(), 28) == (0, None)
+
+    response = dns_message.make_response(query)
+    response.set_rcode(dns.rcode.NXDOMAIN)
+    assert subdomain_finder._parse_response(response.to_wire(), 1) == (dns.rcode.NXDOMAIN, None)
+
+
+def test_raw_udp_resolver_round_trip():
+    class Server(asyncio.DatagramProtocol):
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            # Echo the ID and question back with a single A answer (name compressed)
+            header = data[:2] + b"\x81\x80" + (1).to_bytes(2, "big") + (1).to_bytes(2, "big") + bytes(4)
+            answer = b"\xc0\x0c" + (1).to_bytes(2, "big") + (1).to_bytes(2, "big") + (60).to_bytes(4, "big") + (4).to_bytes(2, "big") + socket.inet_aton("5.6.7.8")
+            self.transport.sendto(header + data[12:] + answer, addr)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(Server, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        resolver = subdomain_finder.RawUDPResolver("127.0.0.1", timeout=2.0, retries=1, port=port, sockets=2)
+        try:
+            return await asyncio.gather(*(resolver.query(f"h{i}.example.com", "A") for i in range(4)))
+        finally:
+            resolver.close()
+            transport.close()
+
+    assert asyncio.run(run()) == [("5.6.7.8", 60)] * 4
+
+
+def test_raw_udp_resolver_ignores_reply_for_another_question():
+    def reply(qid, question, ip):
+        header = qid + b"\x81\x80" + (1).to_bytes(2, "big") + (1).to_bytes(2, "big") + bytes(4)
+        answer = b"\xc0\x0c" + (1).to_bytes(2, "big") + (1).to_bytes(2, "big") + (60).to_bytes(4, "big") + (4).to_bytes(2, "big") + socket.inet_aton(ip)
+        return header + question + answer
+
+    class Server(asyncio.DatagramProtocol):
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            # A late answer for another name that reused this ID arrives first
+            stale = subdomain_finder._encode_question("other.example.com", 1)
+            self.transport.sendto(reply(data[:2], stale, "6.6.6.6"), addr)
+            self.transport.sendto(reply(data[:2], data[12:], "5.6.7.8"), addr)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(Server, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        resolver = subdomain_finder.RawUDPResolver("127.0.0.1", timeout=2.0, retries=1, port=port, sockets=1)
+        try:
+            return await resolver.query("www.example.com", "A")
+        finally:
+            resolver.close()
+            transport.close()
+
+    assert asyncio.run(run()) == ("5.6.7.8", 60)
+
+
+def test_raw_udp_resolver_treats_refused_as_transient():
+    class Server(asyncio.DatagramProtocol):
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            # Echo the query back as a REFUSED response
+            self.transport.sendto(data[:2] + b"\x81\x85" + data[4:], addr)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(Server, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        resolver = subdomain_finder.RawUDPResolver("127.0.0.1", timeout=2.0, retries=1, port=port)
+        try:
+            with pytest.raises(TimeoutError):
+                await resolver.query("www.example.com", "A")
+            return await subdomain_finder.resolve_host_async(resolver, "www.example.com")
+        finally:
+            resolver.close()
+            transport.close()
+
+    assert asyncio.run(run()) is None
+    assert "www.example.com" not in subdomain_finder._DNS_CACHE
+
+
+def test_rotating_resolver_retries_elsewhere_and_drops_bad_server(monkeypatch):
+    monkeypatch.setattr(subdomain_finder, "RESOLVER_MIN_SAMPLES", 2)
+
+    class Good:
+        async def query(self, host, rdtype):
+            return ("1.2.3.4", 60)
+
+        def close(self):
+            pass
+
+    class Dead(Good):
+        async def query(self, host, rdtype):
+            raise TimeoutError(host)
+
+    rotating = subdomain_finder.RotatingResolver({"10.0.0.1": Dead(), "10.0.0.2": Good()}, retries=2)
+
+    async def run():
+        return [await rotating.query(f"h{i}.example.com", "A") for i in range(4)]
+
+    assert asyncio.run(run()) == [("1.2.3.4", 60)] * 4
+    assert rotating.dropped == ["10.0.0.1"]
+
+
+def test_rotating_resolver_spreads_a_queries_over_all_servers():
+    seen = []
+
+    class Recording:
+        def __init__(self, ns):
+            self.ns = ns
+
+        async def query(self, host, rdtype):
+            seen.append((self.ns, rdtype))
+            return None
+
+        def close(self):
+            pass
+
+    servers = ["10.0.0.1", "10.0.0.2"]
+    rotating = subdomain_finder.RotatingResolver({ns: Recording(ns) for ns in servers}, retries=1)
+
+    async def run():
+        for i in range(4):
+            await subdomain_finder.resolve_host_async(rotating, f"h{i}.example.com")
+
+    asyncio.run(run())
+    assert sorted(ns for ns, rdtype in seen if rdtype == "A") == ["10.0.0.1", "10.0.0.1", "10.0.0.2", "10.0.0.2"]
+
+
+def test_raw_udp_resolver_socket_failure_is_transient(monkeypatch):
+    async def run():
+        resolver = subdomain_finder.RawUDPResolver("127.0.0.1", timeout=1.0, retries=1)
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(loop, "create_datagram_endpoint", mock.AsyncMock(side_effect=OSError("no sockets")))
+        with pytest.raises(TimeoutError):
+            await resolver.query("www.example.com", "A")
+        assert await resolver.query("bad..example.com", "A") is None
+
+    asyncio.run(run())
+
+
+def test_resolve_host_async_does_not_cache_timeouts():
+    class FakeResolver:
+        async def query(self, host, rdtype):
+            if host.startswith("slow."):
+                raise TimeoutError(host)
+            return None
+
+    resolve = subdomain_finder.resolve_host_async
+    assert asyncio.run(resolve(FakeResolver(), "slow.example.com")) is None
+    assert asyncio.run(resolve(FakeResolver(), "nope.example.com")) is None
+    assert "slow.example.com" not in subdomain_finder._DNS_CACHE
+    assert subdomain_finder._DNS_CACHE["nope.example.com"][0] is None